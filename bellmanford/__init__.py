@@ -1 +1,4 @@
-from .bellmanford import negative_edge_cycle, bellman_ford, bellman_ford_tree
+from .bellmanford import (
+    BFResult, negative_edge_cycle, bellman_ford, bellman_ford_tree,
+    bellman_ford_csr
+)
@@ -0,0 +1,201 @@
+# cython: boundscheck=False, wraparound=False, cdivision=True
+"""
+Ahead-of-time compiled relaxation loop for Bellman–Ford algorithm.
+
+This is the same algorithm as bellmanford._relax_csr, for installs
+built with Cython, where it avoids the Numba compilation on first use.
+"""
+from libc.math cimport INFINITY
+from libc.stdlib cimport malloc, free
+
+import numpy as np
+
+
+cpdef _relax(int[::1] indptr, int[::1] indices, double[::1] weights,
+             int[::1] source, int n, int lll_max_rotations):
+    """
+    Relaxation loop for Bellman–Ford algorithm on a graph in compressed
+    sparse row (CSR) form.
+
+    Parameters and return values are the same as for
+    bellmanford._relax_csr, but for lll_max_rotations, the most nodes
+    sent to the back of the queue in a row for Large-Label-Last, which
+    is bellmanford._LLL_MAX_ROTATIONS.
+    """
+    dist_arr = np.empty(n)
+    pred_arr = np.empty(n, dtype=np.int32)
+    cdef double[::1] dist = dist_arr
+    cdef int[::1] pred = pred_arr
+
+    cdef int size_n = n if n > 0 else 1
+    cdef unsigned char *in_q = <unsigned char *>malloc(size_n)
+    cdef unsigned char *in_tree = <unsigned char *>malloc(size_n)
+    cdef int *first_child = <int *>malloc(size_n * sizeof(int))
+    cdef int *next_sibling = <int *>malloc(size_n * sizeof(int))
+    cdef int *prev_sibling = <int *>malloc(size_n * sizeof(int))
+    cdef int *stack = <int *>malloc(size_n * sizeof(int))
+    # Ring buffer queue from q[head] to q[tail - 1], wrapping around.
+    cdef int *q = <int *>malloc(size_n * sizeof(int))
+    if (in_q == NULL or in_tree == NULL or first_child == NULL
+            or next_sibling == NULL or prev_sibling == NULL
+            or stack == NULL or q == NULL):
+        free(in_q)
+        free(in_tree)
+        free(first_child)
+        free(next_sibling)
+        free(prev_sibling)
+        free(stack)
+        free(q)
+        raise MemoryError()
+
+    cdef int i, k, s, u, v, p, c, x, prev, nxt, top
+    cdef int head = 0, tail = 0, size = 0, active, rotations = 0
+    cdef int end = -1
+    cdef double dist_u, dist_v, sum_dist = 0.0
+
+    try:
+        for i in range(n):
+            dist[i] = INFINITY
+            pred[i] = -1
+            # 0 if a node is not in the queue, 1 if it is, and 2 if it
+            # is but is to be skipped when it comes off.
+            in_q[i] = 0
+            in_tree[i] = 0
+            first_child[i] = -1
+            next_sibling[i] = -1
+            prev_sibling[i] = -1
+
+        for i in range(source.shape[0]):
+            s = source[i]
+            dist[s] = 0.0
+            if in_q[s] == 0:
+                q[tail] = s
+                tail = tail + 1 if tail + 1 < n else 0
+                size += 1
+                in_q[s] = 1
+
+        # Number and sum of the distances of the nodes in the queue,
+        # for LLL.
+        active = size
+        while size > 0:
+            u = q[head]
+            head = head + 1 if head + 1 < n else 0
+            size -= 1
+            if in_q[u] == 2:
+                in_q[u] = 0
+                continue
+            dist_u = dist[u]
+
+            # Large-Label-Last: send u to the back of the queue while its
+            # distance is above the queue average.
+            if (rotations < active - 1 and rotations < lll_max_rotations
+                    and dist_u * active > sum_dist):
+                q[tail] = u
+                tail = tail + 1 if tail + 1 < n else 0
+                size += 1
+                rotations += 1
+                continue
+            rotations = 0
+
+            in_q[u] = 0
+            active -= 1
+            sum_dist -= dist_u
+
+            # Skip relaxations if the predecessor of u is in the queue.
+            p = pred[u]
+            if p >= 0 and in_q[p] == 1:
+                continue
+
+            for k in range(indptr[u], indptr[u + 1]):
+                v = indices[k]
+                dist_v = dist_u + weights[k]
+
+                if dist_v < dist[v]:
+                    if v == u:
+                        pred[v] = u
+                        end = u
+                        break
+
+                    # The distances below v in the tree were found from
+                    # its old distance, so take those nodes out of the
+                    # tree and the queue.  If u is one of them, the edge
+                    # (u, v) closes a negative cycle.
+                    top = 0
+                    c = first_child[v]
+                    first_child[v] = -1
+                    while c >= 0:
+                        stack[top] = c
+                        top += 1
+                        c = next_sibling[c]
+                    while top > 0:
+                        top -= 1
+                        x = stack[top]
+                        if x == u:
+                            end = v
+                            break
+                        in_tree[x] = 0
+                        if in_q[x] == 1:
+                            in_q[x] = 2
+                            active -= 1
+                            sum_dist -= dist[x]
+                        c = first_child[x]
+                        first_child[x] = -1
+                        while c >= 0:
+                            stack[top] = c
+                            top += 1
+                            c = next_sibling[c]
+                    if end >= 0:
+                        pred[v] = u
+                        break
+
+                    # Move v from under its old predecessor to under u.
+                    if in_tree[v] == 1:
+                        prev = prev_sibling[v]
+                        nxt = next_sibling[v]
+                        if prev >= 0:
+                            next_sibling[prev] = nxt
+                        else:
+                            first_child[pred[v]] = nxt
+                        if nxt >= 0:
+                            prev_sibling[nxt] = prev
+                    nxt = first_child[u]
+                    next_sibling[v] = nxt
+                    prev_sibling[v] = -1
+                    if nxt >= 0:
+                        prev_sibling[nxt] = v
+                    first_child[u] = v
+                    in_tree[v] = 1
+
+                    if in_q[v] == 1:
+                        sum_dist += dist_v - dist[v]
+                    dist[v] = dist_v
+                    pred[v] = u
+
+                    if in_q[v] != 1:
+                        if in_q[v] == 0:
+                            # Smallest-Label-First: put v at the front of
+                            # the queue if its distance is below the
+                            # front's.
+                            if size > 0 and dist_v < dist[q[head]]:
+                                head = head - 1 if head > 0 else n - 1
+                                q[head] = v
+                            else:
+                                q[tail] = v
+                                tail = tail + 1 if tail + 1 < n else 0
+                            size += 1
+                        in_q[v] = 1
+                        active += 1
+                        sum_dist += dist_v
+
+            if end >= 0:
+                break
+    finally:
+        free(in_q)
+        free(in_tree)
+        free(first_child)
+        free(next_sibling)
+        free(prev_sibling)
+        free(stack)
+        free(q)
+
+    return pred_arr, dist_arr, end
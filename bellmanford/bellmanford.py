@@ -1,5 +1,49 @@
 from collections import deque
-from networkx.utils import generate_unique_node
+from functools import partial
+from typing import NamedTuple, Optional, Union
+import networkx as nx
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+    prange = range
+
+try:
+    from ._relax import _relax as _relax_cython
+except ImportError:
+    _relax_cython = None
+
+# Most nodes a compiled queue loop sends to the back in a row for
+# Large-Label-Last.  Bounding this by the queue length instead makes the
+# loop quadratic when most queued distances sit above a mean pulled down
+# by a few, as when negative_edge_cycle() starts every node at 0.
+_LLL_MAX_ROTATIONS = 16
+
+if _relax_cython is not None:
+    _relax_cython = partial(
+        _relax_cython, lll_max_rotations=_LLL_MAX_ROTATIONS
+    )
+
+# Fewest edges for which _bellman_ford_relaxation() hands G to a CSR
+# kernel rather than the pure Python loop.
+_CSR_MIN_EDGES = 10000
+
+_INT32_MAX = np.iinfo(np.int32).max
+
+
+class BFResult(NamedTuple):
+    """
+    Result of negative_edge_cycle(), bellman_ford() and
+    bellman_ford_csr().  It unpacks as (length, nodes, negative_cycle),
+    like the plain tuples these used to return.  length and nodes are
+    None from negative_edge_cycle() if there is no negative cycle.
+    """
+    length: Optional[Union[int, float]]
+    nodes: Optional[list]
+    negative_cycle: bool
+
 
 def negative_edge_cycle(G, weight='weight'):
     """
@@ -15,6 +59,8 @@ def negative_edge_cycle(G, weight='weight'):
 
     Returns
     -------
+    BFResult, with fields:
+
     length : numeric
         Length of a negative edge cycle if one exists, otherwise None.
 
@@ -31,49 +77,37 @@ def negative_edge_cycle(G, weight='weight'):
     >>> import bellmanford as bf
     >>> G = nx.cycle_graph(5, create_using = nx.DiGraph())
     >>> print(bf.negative_edge_cycle(G))
-    (None, [], False)
+    BFResult(length=None, nodes=None, negative_cycle=False)
     >>> G[1][2]['weight'] = -7
     >>> print(bf.negative_edge_cycle(G))
-    (-3, [4, 0, 1, 2, 3, 4], True)
+    BFResult(length=-3, nodes=[1, 2, 3, 4, 0, 1], negative_cycle=True)
 
     Notes
     -----
     Edge weight attributes must be numerical.
     Distances are calculated as sums of weighted edges traversed.
 
-    This algorithm uses bellman_ford() but finds negative cycles
-    on any component by first adding a new node connected to
-    every node, and starting bellman_ford on that node.  It then
-    removes that extra node.
-    """
-    newnode = generate_unique_node()
-    G.add_edges_from([(newnode, n) for n in G])
-
-    try:
-        pred, dist, negative_cycle_end = bellman_ford_tree(G, newnode, weight)
-
-        if negative_cycle_end:
-            nodes = []
-            negative_cycle = True
-            end = negative_cycle_end
-            while True:
-                nodes.insert(0, end)
-                if nodes.count(end) > 1:
-                    end_index = nodes[1:].index(end) + 2
-                    nodes = nodes[:end_index]
-                    break
-                end = pred[end]
-            length = sum(
-                G[u][v].get(weight, 1) for (u, v) in zip(nodes, nodes[1:])
-            )
-        else:
-            nodes = None
-            negative_cycle = False
-            length = None
+    This algorithm finds negative cycles on any component by starting
+    the Bellman-Ford relaxation loop from every node at distance 0, as
+    if from a new node connected to every node.  G is not modified.
+    """
+    pred = {v: None for v in G}
+    dist = {v: 0 for v in G}
+    pred, dist, negative_cycle_end = _bellman_ford_relaxation(
+        G, pred, dist, list(G), weight
+    )
+
+    if negative_cycle_end is not None:
+        negative_cycle = True
+        length, nodes = _cycle_nodes(
+            pred, negative_cycle_end, _edge_weight(G, weight)
+        )
+    else:
+        nodes = None
+        negative_cycle = False
+        length = None
 
-        return length, nodes, negative_cycle
-    finally:
-        G.remove_node(newnode)
+    return BFResult(length, nodes, negative_cycle)
 
 
 def bellman_ford(G, source, target, weight='weight'):
@@ -102,6 +136,8 @@ def bellman_ford(G, source, target, weight='weight'):
 
     Returns
     -------
+    BFResult, with fields:
+
     length : numeric
         Length of a negative cycle if one exists.
         Otherwise, length of a shortest path.
@@ -113,51 +149,44 @@ def bellman_ford(G, source, target, weight='weight'):
         List is empty if source and target are not connected.
 
     negative_cycle : bool
-        True if a negative edge cycle exists, otherwise False.
+        True if a negative edge cycle reachable from source exists,
+        otherwise False.  False if target cannot be reached from
+        source, even if source can reach a negative cycle.
 
     Examples
     --------
     >>> import networkx as nx
     >>> G = nx.path_graph(5, create_using = nx.DiGraph())
     >>> bf.bellman_ford(G, source=0, target=4)
-    (3, [1, 2, 3, 4], False)
+    BFResult(length=4, nodes=[0, 1, 2, 3, 4], negative_cycle=False)
+
+    Notes
+    -----
+    If target cannot be reached from source, no negative cycle that
+    source reaches can lie on a path to target, so this returns
+    (inf, [], False) without running the Bellman-Ford algorithm.
     """
+    # A breadth-first search from both ends is cheap next to the
+    # relaxation loop, and settles unreachable targets outright.
+    if source in G and (
+        target not in G or not nx.has_path(G, source, target)
+    ):
+        return BFResult(float('inf'), [], False)
+
     # Get shortest path tree
     pred, dist, negative_cycle_end = bellman_ford_tree(G, source, weight)
 
-    nodes = []
-
-    if negative_cycle_end:
+    if negative_cycle_end is not None:
         negative_cycle = True
-        end = negative_cycle_end
-        while True:
-            nodes.insert(0, end)
-            if nodes.count(end) > 1:
-                end_index = nodes[1:].index(end) + 2
-                nodes = nodes[:end_index]
-                break
-            end = pred[end]
-    else:
-        negative_cycle = False
-        end = target
-        while True:
-            nodes.insert(0, end)
-            # If end has no predecessor
-            if pred.get(end, None) is None:
-                # If end is not s, then there is no s-t path
-                if end != source:
-                    nodes = []
-                break
-            end = pred[end]
-
-    if nodes:
-        length = sum(
-            G[u][v].get(weight, 1) for (u, v) in zip(nodes, nodes[1:])
+        length, nodes = _cycle_nodes(
+            pred, negative_cycle_end, _edge_weight(G, weight)
         )
     else:
-        length = float('inf')
+        negative_cycle = False
+        nodes = _path_nodes(pred, source, target)
+        length = dist[target] if nodes else float('inf')
 
-    return length, nodes, negative_cycle
+    return BFResult(length, nodes, negative_cycle)
 
 
 def bellman_ford_tree(G, source, weight='weight'):
@@ -190,7 +219,8 @@ def bellman_ford_tree(G, source, weight='weight'):
 
     negative_cycle_end : node label
         Backtrack from this node using pred to find a negative cycle, if
-        one exists; otherwise None.
+        one exists; otherwise None.  Always None if no edge weight is
+        negative.
 
     Examples
     --------
@@ -204,8 +234,8 @@ def bellman_ford_tree(G, source, weight='weight'):
 
     >>> G = nx.cycle_graph(5, create_using = nx.DiGraph())
     >>> G[1][2]['weight'] = -7
-    >>> bf_bellman_ford_tree(G, 0)
-    ({0: 4, 1: 0, 2: 1, 3: 2, 4: 3}, {0: -12, 1: -11, 2: -15, 3: -14, 4: -13}, 0)
+    >>> bf.bellman_ford_tree(G, 0)
+    ({0: 4, 1: 0, 2: 1, 3: 2, 4: 3}, {0: 0, 1: 1, 2: -6, 3: -5, 4: -4}, 0)
 
     Notes
     -----
@@ -219,16 +249,253 @@ def bellman_ford_tree(G, source, weight='weight'):
     not containing the source contains a negative cost (di)cycle, it
     will not be detected.
 
+    If every edge has weight 1, including graphs without weight
+    attributes, a breadth-first search is used instead, in O(n + m)
+    time.  Otherwise, if no edge weight is negative, Dijkstra's
+    algorithm is used, in O((n + m) log n) time.
+
     """
     if source not in G:
         raise KeyError("Node %s is not found in the graph" % source)
 
+    # One pass over the edge weights picks the algorithm, and stops at the
+    # first negative weight.
+    unit = True
+    for _, _, w in G.edges(data=weight, default=1):
+        if w < 0:
+            break
+        if unit and (type(w) is not int or w != 1):
+            unit = False
+    else:
+        if unit:
+            return _unit_weight_shortest_path(G, source)
+        return _dijkstra_shortest_path(G, source, weight)
+
     dist = {source: 0}
     pred = {source: None}
 
     return _bellman_ford_relaxation(G, pred, dist, [source], weight)
 
 
+def bellman_ford_csr(M, source, target, parallel=False):
+    """
+    Compute shortest path and shortest path lengths between a source node
+    and target node in a weighted graph given as a sparse matrix, using
+    the Bellman-Ford algorithm.
+
+    Parameters
+    ----------
+    M : scipy.sparse CSR matrix or array
+        Square matrix with an entry (u, v) holding the weight of each
+        edge from node u to node v.  Nodes are the row indices.  Other
+        formats raise TypeError; convert them with M.tocsr() first.  M
+        can have at most 2**31 - 1 rows and stored entries.
+
+    source: int
+        Source node
+
+    target: int
+        Target node
+
+    parallel: bool, optional (default=False)
+        If True and Numba is installed, relax all edges in parallel
+        sweeps over the CPU cores rather than one node at a time.  This
+        pays off on large graphs.
+
+    Returns
+    -------
+    BFResult, with fields:
+
+    length : numeric
+        Length of a negative cycle if one exists.
+        Otherwise, length of a shortest path.
+        Length is inf if source and target are not connected.
+
+    nodes: list
+        List of nodes in a negative edge cycle (in order) if one exists.
+        Otherwise, list of nodes in a shortest path.
+        List is empty if source and target are not connected.
+
+    negative_cycle : bool
+        True if a negative edge cycle reachable from source exists,
+        otherwise False.  False if target cannot be reached from
+        source, even if source can reach a negative cycle.
+
+    Examples
+    --------
+    >>> import scipy.sparse as sp
+    >>> M = sp.csr_array(([1, 1, 1, 1], ([0, 1, 2, 3], [1, 2, 3, 4])),
+    ...                  shape=(5, 5))
+    >>> bf.bellman_ford_csr(M, source=0, target=4)
+    BFResult(length=4, nodes=[0, 1, 2, 3, 4], negative_cycle=False)
+
+    Notes
+    -----
+    Unlike bellman_ford(), this works directly on the CSR arrays of M,
+    with no NetworkX graph in between.  Explicitly stored zeros are
+    edges of weight 0.  If M has duplicate entries for an edge, the
+    smallest is used.
+
+    As in bellman_ford(), an unreachable target gives (inf, [], False)
+    without running the Bellman-Ford algorithm.
+    """
+    # A CSC matrix has the same attributes with rows and columns
+    # swapped, and converting other formats would sum duplicate entries.
+    if getattr(M, 'format', None) != 'csr':
+        raise TypeError("M must be a sparse matrix in CSR format")
+    n, n_cols = M.shape
+    if n != n_cols:
+        raise ValueError("M must be a square matrix")
+    # The kernels hold node and edge indices as int32.
+    if n > _INT32_MAX or M.nnz > _INT32_MAX:
+        raise ValueError("M has too many rows or entries for int32 indices")
+    for node in (source, target):
+        if not 0 <= node < n:
+            raise KeyError("Node %s is not found in the graph" % node)
+
+    indptr = np.ascontiguousarray(M.indptr, dtype=np.int32)
+    indices = np.ascontiguousarray(M.indices, dtype=np.int32)
+    weights = np.ascontiguousarray(M.data, dtype=np.float64)
+    integral = M.data.dtype.kind in 'biu' or not len(weights)
+
+    if not _csr_has_path(indptr, indices, source, target):
+        return BFResult(float('inf'), [], False)
+
+    if parallel and njit is not None:
+        relax = _relax_sweep_parallel
+    elif _relax_cython is not None:
+        relax = _relax_cython
+    elif njit is not None:
+        relax = _relax_csr
+    else:
+        relax = _relax_sweep
+    src = np.array([source], dtype=np.int32)
+    pred, dist, end = relax(indptr, indices, weights, src, n)
+    pred = pred.tolist()
+
+    def edge_weight(u, v):
+        row = slice(indptr[u], indptr[u + 1])
+        return weights[row][indices[row] == v].min()
+
+    if end >= 0:
+        negative_cycle = True
+        length, nodes = _cycle_nodes(pred, end, edge_weight)
+    elif dist[target] < np.inf:
+        negative_cycle = False
+        nodes = [target]
+        while nodes[-1] != source:
+            nodes.append(pred[nodes[-1]])
+        nodes.reverse()
+        length = dist[target]
+    else:
+        return BFResult(float('inf'), [], False)
+
+    length = int(length) if integral else float(length)
+    return BFResult(length, nodes, negative_cycle)
+
+
+def _unit_weight_shortest_path(G, source):
+    """
+    Compute shortest path lengths and predecessors on shortest paths
+    from source by breadth-first search, for graphs in which every edge
+    has weight 1.  Returns the same as bellman_ford_tree().
+    """
+    G_succ = G.succ if G.is_directed() else G.adj
+
+    pred = {source: None}
+    dist = {source: 0}
+    level = [source]
+    d = 0
+    while level:
+        d += 1
+        next_level = []
+        for u in level:
+            for v in G_succ[u]:
+                if v not in dist:
+                    dist[v] = d
+                    pred[v] = u
+                    next_level.append(v)
+        level = next_level
+
+    negative_cycle_end = None
+    return pred, dist, negative_cycle_end
+
+
+def _dijkstra_shortest_path(G, source, weight):
+    """
+    Compute shortest path lengths and predecessors on shortest paths
+    from source by Dijkstra's algorithm, for graphs without negative
+    edge weights.  Returns the same as bellman_ford_tree().
+    """
+    preds, dist = nx.dijkstra_predecessor_and_distance(G, source, weight=weight)
+
+    # Of the predecessors on shortest paths to a node, the first is the
+    # one it was first reached from, which was settled before it, so
+    # these form a tree even with edges of weight 0.  The source can
+    # still list itself, through a self-loop of weight 0.
+    pred = {v: p[0] if v != source else None for v, p in preds.items()}
+
+    negative_cycle_end = None
+    return pred, dist, negative_cycle_end
+
+
+def _cycle_nodes(pred, end, edge_weight):
+    """
+    Backtrack from end using pred until a node repeats, and return the
+    total weight of the cycle found, from edge_weight(u, v) for each of
+    its edges (u, v), and its nodes, in order, with the first node
+    repeated at the end.
+    """
+    seen = {}
+    nodes = []
+    # Weight of the edges walked before reaching each node in nodes.
+    lengths = []
+    length = 0
+    while end not in seen:
+        seen[end] = len(nodes)
+        nodes.append(end)
+        lengths.append(length)
+        length += edge_weight(pred[end], end)
+        end = pred[end]
+
+    cycle = nodes[seen[end]:]
+    cycle.append(end)
+    cycle.reverse()
+    return length - lengths[seen[end]], cycle
+
+
+def _edge_weight(G, weight):
+    """
+    Return a function giving the weight of the edge (u, v) of G, or of
+    the lightest of the parallel edges from u to v if G is a multigraph.
+    """
+    if G.is_multigraph():
+        return lambda u, v: min(d.get(weight, 1) for d in G[u][v].values())
+    return lambda u, v: G[u][v].get(weight, 1)
+
+
+def _path_nodes(pred, source, target):
+    """
+    Backtrack from target using pred, and return the nodes of the path
+    from source to target, in order.  The list is empty if target has
+    no path back to source.
+    """
+    nodes = []
+    end = target
+    while True:
+        nodes.append(end)
+        # If end has no predecessor
+        if pred.get(end, None) is None:
+            # If end is not s, then there is no s-t path
+            if end != source:
+                return []
+            break
+        end = pred[end]
+
+    nodes.reverse()
+    return nodes
+
+
 def _bellman_ford_relaxation(G, pred, dist, source, weight):
     """
     Relaxation loop for Bellman–Ford algorithm
@@ -259,17 +526,62 @@ def _bellman_ford_relaxation(G, pred, dist, source, weight):
         Backtrack from this node using pred to find a negative cycle, if
         one exists; otherwise None.
     """
-    if G.is_multigraph():
-        def get_weight(edge_dict):
-            return min(eattr.get(weight, 1) for eattr in edge_dict.values())
-    else:
-        def get_weight(edge_dict):
-            return edge_dict.get(weight, 1)
+    # On small graphs, _relax_dicts() finishes before the CSR arrays are
+    # built, let alone the Numba kernel compiled or loaded from cache.
+    if G.number_of_edges() >= _CSR_MIN_EDGES:
+        # Prefer the Cython kernel, which needs no compiling on first use.
+        if _relax_cython is not None:
+            return _bellman_ford_relaxation_csr(
+                G, pred, dist, source, weight, _relax_cython
+            )
+
+        if njit is not None:
+            return _bellman_ford_relaxation_csr(
+                G, pred, dist, source, weight, _relax_csr
+            )
+
+        # Without Numba, a queue that starts out holding many nodes, as
+        # in negative_edge_cycle(), is better worked off in NumPy sweeps.
+        if len(source) > 1:
+            return _bellman_ford_relaxation_csr(
+                G, pred, dist, source, weight, _relax_sweep
+            )
+
+    negative_cycle_end = _relax_dicts(G, pred, dist, source, weight)
+    return pred, dist, negative_cycle_end
 
+
+def _relax_dicts(G, pred, dist, source, weight):
+    """
+    Relaxation loop for Bellman–Ford algorithm in pure Python, updating
+    pred and dist in place.
+
+    Edge weights are read from G as the tails of the edges leave the
+    queue.  Most nodes do so only a few times, so this is cheaper than
+    collecting every edge weight up front, except for multigraphs, whose
+    parallel edges are first collapsed to the lightest.
+
+    Parameters and return value are the same as for
+    _bellman_ford_relaxation(), but for returning only
+    negative_cycle_end.
+    """
     G_succ = G.succ if G.is_directed() else G.adj
+    if G.is_multigraph():
+        G_succ = {
+            u: {
+                v: {weight: min(eattr.get(weight, 1) for eattr in e.values())}
+                for v, e in nbrs.items()
+            }
+            for u, nbrs in G_succ.items()
+        }
     inf = float('inf')
     n = len(G)
 
+    # Unlike the compiled kernels, this does not take stale subtrees out
+    # of the queue, as keeping the tree up to date in pure Python costs
+    # more than the relaxations it saves.  Instead, a node queued n
+    # times points to a negative cycle, once backtracking n steps from
+    # the node that queued it no longer reaches a source.
     count = {}
     q = deque(source)
     in_q = set(source)
@@ -278,26 +590,464 @@ def _bellman_ford_relaxation(G, pred, dist, source, weight):
         in_q.remove(u)
 
         # Skip relaxations if the predecessor of u is in the queue.
-        if pred[u] not in in_q:
-            dist_u = dist[u]
+        if pred[u] in in_q:
+            continue
 
-            for v, e in G_succ[u].items():
-                dist_v = dist_u + get_weight(e)
+        dist_u = dist[u]
+        for v, e in G_succ[u].items():
+            dist_v = dist_u + e.get(weight, 1)
 
-                if dist_v < dist.get(v, inf):
-                    dist[v] = dist_v
+            if dist_v < dist.get(v, inf):
+                if v == u:
                     pred[v] = u
+                    return u
 
-                    if v not in in_q:
-                        q.append(v)
-                        in_q.add(v)
-                        count_v = count.get(v, 0) + 1
+                dist[v] = dist_v
+                pred[v] = u
 
-                        if count_v == n:
-                            negative_cycle_end = u
-                            return pred, dist, negative_cycle_end
+                if v not in in_q:
+                    q.append(v)
+                    in_q.add(v)
+                    count_v = count.get(v, 0) + 1
+                    count[v] = count_v
 
-                        count[v] = count_v
+                    if count_v % n == 0:
+                        end = u
+                        for _ in range(n):
+                            end = pred[end]
+                            if end is None:
+                                break
+                        else:
+                            return end
 
-    negative_cycle_end = None
+    return None
+
+
+def _bellman_ford_relaxation_csr(G, pred, dist, source, weight, relax):
+    """
+    Relaxation loop for Bellman–Ford algorithm, run by relax on a
+    compressed sparse row (CSR) copy of G.
+
+    Parameters and return values are the same as for
+    _bellman_ford_relaxation.  relax is _relax_cython, _relax_csr or
+    _relax_sweep.
+    Every node in source starts at distance 0.
+    """
+    index, nodes, indptr, indices, weights = _to_csr(G, weight)
+    n = len(nodes)
+    # Hand back integer distances for integer weights, as the pure
+    # Python loop does.
+    integral = weights.dtype.kind in 'biu' or not len(weights)
+    weights = weights.astype(np.float64)
+
+    src = np.array([index[s] for s in source], dtype=np.int32)
+    pred_idx, dist_idx, end = relax(indptr, indices, weights, src, n)
+
+    reached = np.flatnonzero(dist_idx < np.inf)
+    dist_reached = dist_idx[reached]
+    if integral:
+        dist_reached = dist_reached.astype(np.int64)
+    for i, p, d in zip(reached.tolist(), pred_idx[reached].tolist(),
+                       dist_reached.tolist()):
+        node = nodes[i]
+        if p >= 0:
+            pred[node] = nodes[p]
+        dist[node] = d
+
+    negative_cycle_end = nodes[end] if end >= 0 else None
     return pred, dist, negative_cycle_end
+
+
+def _to_csr(G, weight):
+    """
+    Copy the edges of G into compressed sparse row (CSR) arrays.
+
+    Parameters
+    ----------
+    G : NetworkX graph
+
+    weight: string
+       Edge data key corresponding to the edge weight
+
+    Returns
+    -------
+    node_to_idx : dict
+        Keyed by node to its index in the arrays
+
+    idx_to_node : list
+        Node at each index
+
+    indptr : int32 array of length n + 1
+        The edges leaving node u are indptr[u]:indptr[u + 1]
+
+    indices : int32 array
+        Head node of each edge
+
+    weights : array
+        Weight of each edge, with an integer dtype if every weight is an
+        integer.  For multigraphs, the smallest weight of the parallel
+        edges.
+    """
+    G_succ = G.succ if G.is_directed() else G.adj
+    idx_to_node = list(G)
+    node_to_idx = {node: i for i, node in enumerate(idx_to_node)}
+    n = len(idx_to_node)
+
+    indptr = np.zeros(n + 1, dtype=np.int32)
+    np.cumsum(
+        np.fromiter((len(G_succ[u]) for u in idx_to_node), np.int32, n),
+        out=indptr[1:],
+    )
+    m = int(indptr[-1])
+    indices = np.fromiter(
+        (node_to_idx[v] for u in idx_to_node for v in G_succ[u]),
+        np.int32, m,
+    )
+    if G.is_multigraph():
+        weights = np.array([
+            min(eattr.get(weight, 1) for eattr in e.values())
+            for u in idx_to_node for e in G_succ[u].values()
+        ])
+    else:
+        weights = np.array([
+            e.get(weight, 1) for u in idx_to_node for e in G_succ[u].values()
+        ])
+
+    return node_to_idx, idx_to_node, indptr, indices, weights
+
+
+def _relax_csr(indptr, indices, weights, source, n):
+    """
+    Relaxation loop for Bellman–Ford algorithm on a graph in compressed
+    sparse row (CSR) form, compiled with Numba when it is installed.
+
+    Parameters
+    ----------
+    indptr : int32 array of length n + 1
+        The edges leaving node u are indptr[u]:indptr[u + 1]
+
+    indices : int32 array
+        Head node of each edge
+
+    weights : float64 array
+        Weight of each edge
+
+    source : int32 array
+        Source nodes, each starting at distance 0
+
+    n : int
+        Number of nodes
+
+    Returns
+    -------
+    pred : int32 array
+        Predecessor of each node in the path, -1 if there is none
+
+    dist : float64 array
+        Distance of each node from the sources, inf if unreached
+
+    negative_cycle_end : int
+        Backtrack from this node using pred to find a negative cycle, if
+        one exists; otherwise -1.
+    """
+    dist = np.full(n, np.inf)
+    pred = np.full(n, -1, dtype=np.int32)
+    # 0 if a node is not in the queue, 1 if it is, and 2 if it is but
+    # is to be skipped when it comes off.
+    in_q = np.zeros(n, dtype=np.uint8)
+
+    # Shortest path tree, as linked lists of children.  in_tree marks
+    # the nodes hanging from their pred in the lists.
+    first_child = np.full(n, -1, dtype=np.int32)
+    next_sibling = np.full(n, -1, dtype=np.int32)
+    prev_sibling = np.full(n, -1, dtype=np.int32)
+    in_tree = np.zeros(n, dtype=np.uint8)
+    stack = np.empty(max(n, 1), dtype=np.int32)
+
+    # Ring buffer queue from q[head] to q[tail - 1], wrapping around;
+    # in_q keeps at most n nodes in it at once.
+    q = np.empty(max(n, 1), dtype=np.int32)
+    head = 0
+    tail = 0
+    size = 0
+    for s in source:
+        dist[s] = 0.0
+        if in_q[s] == 0:
+            q[tail] = s
+            tail = tail + 1 if tail + 1 < n else 0
+            size += 1
+            in_q[s] = 1
+
+    # Number and sum of the distances of the nodes in the queue, for LLL.
+    active = size
+    sum_dist = 0.0
+    rotations = 0
+    while size > 0:
+        u = q[head]
+        head = head + 1 if head + 1 < n else 0
+        size -= 1
+        if in_q[u] == 2:
+            in_q[u] = 0
+            continue
+        dist_u = dist[u]
+
+        # Large-Label-Last: send u to the back of the queue while its
+        # distance is above the queue average.
+        if (rotations < active - 1 and rotations < _LLL_MAX_ROTATIONS
+                and dist_u * active > sum_dist):
+            q[tail] = u
+            tail = tail + 1 if tail + 1 < n else 0
+            size += 1
+            rotations += 1
+            continue
+        rotations = 0
+
+        in_q[u] = 0
+        active -= 1
+        sum_dist -= dist_u
+
+        # Skip relaxations if the predecessor of u is in the queue.
+        p = pred[u]
+        if p >= 0 and in_q[p] == 1:
+            continue
+
+        for k in range(indptr[u], indptr[u + 1]):
+            v = indices[k]
+            dist_v = dist_u + weights[k]
+
+            if dist_v < dist[v]:
+                if v == u:
+                    pred[v] = u
+                    return pred, dist, u
+
+                # The distances below v in the tree were found from its
+                # old distance, so take those nodes out of the tree and
+                # the queue.  If u is one of them, the edge (u, v)
+                # closes a negative cycle.
+                top = 0
+                c = first_child[v]
+                first_child[v] = -1
+                while c >= 0:
+                    stack[top] = c
+                    top += 1
+                    c = next_sibling[c]
+                while top > 0:
+                    top -= 1
+                    x = stack[top]
+                    if x == u:
+                        pred[v] = u
+                        return pred, dist, v
+                    in_tree[x] = 0
+                    if in_q[x] == 1:
+                        in_q[x] = 2
+                        active -= 1
+                        sum_dist -= dist[x]
+                    c = first_child[x]
+                    first_child[x] = -1
+                    while c >= 0:
+                        stack[top] = c
+                        top += 1
+                        c = next_sibling[c]
+
+                # Move v from under its old predecessor to under u.
+                if in_tree[v] == 1:
+                    prev = prev_sibling[v]
+                    nxt = next_sibling[v]
+                    if prev >= 0:
+                        next_sibling[prev] = nxt
+                    else:
+                        first_child[pred[v]] = nxt
+                    if nxt >= 0:
+                        prev_sibling[nxt] = prev
+                nxt = first_child[u]
+                next_sibling[v] = nxt
+                prev_sibling[v] = -1
+                if nxt >= 0:
+                    prev_sibling[nxt] = v
+                first_child[u] = v
+                in_tree[v] = 1
+
+                if in_q[v] == 1:
+                    sum_dist += dist_v - dist[v]
+                dist[v] = dist_v
+                pred[v] = u
+
+                if in_q[v] != 1:
+                    if in_q[v] == 0:
+                        # Smallest-Label-First: put v at the front of the
+                        # queue if its distance is below the front's.
+                        if size > 0 and dist_v < dist[q[head]]:
+                            head = head - 1 if head > 0 else n - 1
+                            q[head] = v
+                        else:
+                            q[tail] = v
+                            tail = tail + 1 if tail + 1 < n else 0
+                        size += 1
+                    in_q[v] = 1
+                    active += 1
+                    sum_dist += dist_v
+
+    return pred, dist, -1
+
+
+if njit is not None:
+    _relax_csr = njit(cache=True)(_relax_csr)
+
+
+def _relax_sweep(indptr, indices, weights, source, n):
+    """
+    Relaxation loop for Bellman–Ford algorithm on a graph in compressed
+    sparse row (CSR) form, run as NumPy sweeps.
+
+    Each sweep relaxes every edge leaving the nodes whose distance
+    changed in the previous sweep, all at once.  Parameters and return
+    values are the same as for _relax_csr.
+    """
+    dist = np.full(n, np.inf)
+    pred = np.full(n, -1, dtype=np.int32)
+    dist[source] = 0.0
+    frontier = np.unique(source)
+
+    sweeps = 0
+    while frontier.size:
+        tails, edge_ids = _frontier_edges(indptr, frontier)
+        heads = indices[edge_ids]
+        cand = dist[tails] + weights[edge_ids]
+
+        # Stop as soon as a sweep would change nothing, and otherwise
+        # scatter only the edges that improve a distance.
+        better = cand < dist[heads]
+        if not better.any():
+            break
+        heads = heads[better]
+        tails = tails[better]
+        cand = cand[better]
+        np.minimum.at(dist, heads, cand)
+
+        # Each changed node takes as predecessor a tail achieving the
+        # new distance.
+        win = cand == dist[heads]
+        pred[heads[win]] = tails[win]
+        frontier = np.unique(heads)
+
+        # With a negative cycle the sweeps never stop, and pred then
+        # eventually has a cycle.  After 1, 2, 4, ... sweeps, look for a
+        # node whose pred chain is n steps long, so that a cycle is found
+        # within twice the sweeps it takes to appear.
+        sweeps += 1
+        if sweeps & (sweeps - 1) == 0 and frontier.size:
+            end = _pred_cycle_node(pred, n)
+            if end >= 0:
+                return pred, dist, end
+
+    return pred, dist, -1
+
+
+def _frontier_edges(indptr, frontier):
+    """
+    Return the tails and the edge ids of the edges leaving the nodes in
+    frontier, in CSR order.
+    """
+    starts = indptr[frontier]
+    counts = indptr[frontier + 1] - starts
+    offsets = np.cumsum(counts) - counts
+    edge_ids = np.arange(counts.sum()) - np.repeat(offsets - starts, counts)
+    tails = np.repeat(frontier, counts)
+    return tails, edge_ids
+
+
+def _csr_has_path(indptr, indices, source, target):
+    """
+    Return True if target can be reached from source in a graph in
+    compressed sparse row (CSR) form, by breadth-first search.
+    """
+    seen = np.zeros(len(indptr) - 1, dtype=bool)
+    seen[source] = True
+    frontier = np.array([source])
+    while frontier.size and not seen[target]:
+        _, edge_ids = _frontier_edges(indptr, frontier)
+        heads = indices[edge_ids]
+        frontier = np.unique(heads[~seen[heads]])
+        seen[frontier] = True
+
+    return bool(seen[target])
+
+
+def _pred_cycle_node(pred, n):
+    """
+    Return a node on a cycle of the predecessor array pred, or -1 if it
+    has none, by following n steps of pred from every node at once.
+    """
+    # Node n stands for "no predecessor" and leads to itself.
+    jump = np.append(np.where(pred >= 0, pred, n), n)
+    steps = 1
+    while steps < n:
+        jump = jump[jump]
+        steps *= 2
+
+    on_cycle = np.flatnonzero(jump[:n] != n)
+    return int(jump[on_cycle[0]]) if on_cycle.size else -1
+
+
+def _relax_sweep_parallel(indptr, indices, weights, source, n):
+    """
+    Relaxation loop for Bellman–Ford algorithm on a graph in compressed
+    sparse row (CSR) form, run as sweeps over all nodes in parallel with
+    Numba.
+
+    In each sweep every node takes the best distance over its incoming
+    edges, so the dist and pred entries of a node are only written by
+    one thread.  Reading a tail's distance while another thread lowers
+    it is harmless; the node is improved again in the next sweep.
+    Parameters and return values are the same as for _relax_csr.
+    """
+    # Incoming edges of each node, in compressed sparse column form.
+    order = np.argsort(indices, kind='stable')
+    in_ptr = np.zeros(n + 1, dtype=np.int32)
+    np.cumsum(np.bincount(indices, minlength=n), out=in_ptr[1:])
+    tails = np.repeat(np.arange(n, dtype=np.int32), np.diff(indptr))[order]
+    in_weights = weights[order]
+
+    dist = np.full(n, np.inf)
+    pred = np.full(n, -1, dtype=np.int32)
+    dist[source] = 0.0
+
+    # With a negative cycle the sweeps never stop, and pred then
+    # eventually has a cycle; look for one after 1, 2, 4, ... sweeps, as
+    # in _relax_sweep.
+    sweeps = 0
+    while _pull_sweep(in_ptr, tails, in_weights, dist, pred):
+        sweeps += 1
+        if sweeps & (sweeps - 1) == 0:
+            end = _pred_cycle_node(pred, n)
+            if end >= 0:
+                return pred, dist, end
+
+    return pred, dist, -1
+
+
+def _pull_sweep(in_ptr, tails, weights, dist, pred):
+    """
+    Relax every edge once, with each node in parallel taking the best
+    distance over its incoming edges.  Returns True if any distance
+    changed.
+    """
+    changed = 0
+    for v in prange(len(dist)):
+        best = dist[v]
+        best_u = -1
+        for k in range(in_ptr[v], in_ptr[v + 1]):
+            dist_v = dist[tails[k]] + weights[k]
+            if dist_v < best:
+                best = dist_v
+                best_u = tails[k]
+        if best_u >= 0:
+            dist[v] = best
+            pred[v] = best_u
+            changed += 1
+
+    return changed > 0
+
+
+if njit is not None:
+    _pull_sweep = njit(parallel=True, cache=True)(_pull_sweep)
@@ -6,6 +6,18 @@ try:
 except ImportError:
     long_description = ''
 
+try:
+    from Cython.Build import cythonize
+    ext_modules = cythonize([
+        setuptools.Extension('bellmanford._relax', ['bellmanford/_relax.pyx'])
+    ])
+    # Without a working C compiler, install without the Cython kernel.
+    # cythonize() does not carry optional over, so set it here.
+    for ext in ext_modules:
+        ext.optional = True
+except ImportError:
+    ext_modules = []
+
 setuptools.setup(
     name='bellmanford',
     version='0.2.1',
@@ -19,5 +31,7 @@ setuptools.setup(
     author_email='nelson@uhan.me',
     license='BSD',
     packages=['bellmanford'],
-    install_requires=['networkx'],
+    ext_modules=ext_modules,
+    install_requires=['networkx', 'numpy'],
+    extras_require={'numba': ['numba']},
 )
@@ -0,0 +1,23 @@
+"""
+The shortest path problem in test/simple.py, with the digraph given as
+a sparse matrix and nodes numbered from 0.
+
+Expected solution:
+    - Negative cycle? False
+    - Shortest path length = 3
+    - Shortest path = [0, 1, 2, 3]
+"""
+
+import scipy.sparse as sp
+import bellmanford as bf
+
+tails = [0, 0, 1, 1, 2]
+heads = [1, 2, 2, 3, 3]
+lengths = [1, 100, 1, 100, 1]
+M = sp.csr_array((lengths, (tails, heads)), shape=(4, 4))
+
+length, nodes, negative_cycle = bf.bellman_ford_csr(M, source=0, target=3)
+
+print("Negative cycle?", negative_cycle)
+print("Shortest path length =", length)
+print("Shortest path =", nodes)
@@ -0,0 +1,25 @@
+"""
+A shortest path problem on a multidigraph with parallel edges of
+different lengths, where only the shortest of each is used.
+
+Expected solution:
+    - Negative cycle? False
+    - Shortest path length = 1
+    - Shortest path = [1, 2, 3]
+"""
+
+import networkx as nx
+import bellmanford as bf
+
+G = nx.MultiDiGraph()
+G.add_edge(1, 2, length=4)
+G.add_edge(1, 2, length=-1)
+G.add_edge(2, 3, length=7)
+G.add_edge(2, 3, length=2)
+G.add_edge(1, 3, length=5)
+
+length, nodes, negative_cycle = bf.bellman_ford(G, source=1, target=3, weight='length')
+
+print("Negative cycle?", negative_cycle)
+print("Shortest path length =", length)
+print("Shortest path =", nodes)
@@ -0,0 +1,24 @@
+"""
+A negative cycle search on a digraph with 20000 nodes, large enough to
+be handed to the CSR kernels, or to the NumPy sweeps without Numba.  The
+nodes form a ring of edges of length 1, with one edge of length -6000
+closing a cycle 5000 -> 5001 -> ... -> 10000 -> 5000.
+
+Expected solution:
+    - Negative cycle? True
+    - Negative cycle length = -1000
+    - Nodes in negative cycle = 5001
+"""
+
+import networkx as nx
+import bellmanford as bf
+
+G = nx.cycle_graph(20000, create_using=nx.DiGraph())
+nx.set_edge_attributes(G, 1, 'length')
+G.add_edge(10000, 5000, length=-6000)
+
+length, nodes, negative_cycle = bf.negative_edge_cycle(G, weight='length')
+
+print("Negative cycle?", negative_cycle)
+print("Negative cycle length =", length)
+print("Nodes in negative cycle =", len(set(nodes)))
@@ -0,0 +1,27 @@
+"""
+A shortest path problem on a digraph with no negative edge lengths, so
+that Dijkstra's algorithm is used.  Some edges have length 0, including
+a self-loop at the source and a cycle 1 -> 2 -> 1 through it.
+
+Expected solution:
+    - Negative cycle? False
+    - Shortest path length = 2
+    - Shortest path = [1, 2, 3, 4]
+"""
+
+import networkx as nx
+import bellmanford as bf
+
+G = nx.DiGraph()
+G.add_edge(1, 1, length=0)
+G.add_edge(1, 2, length=0)
+G.add_edge(2, 1, length=0)
+G.add_edge(1, 3, length=5)
+G.add_edge(2, 3, length=2)
+G.add_edge(3, 4, length=0)
+
+length, nodes, negative_cycle = bf.bellman_ford(G, source=1, target=4, weight='length')
+
+print("Negative cycle?", negative_cycle)
+print("Shortest path length =", length)
+print("Shortest path =", nodes)
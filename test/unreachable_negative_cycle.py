@@ -0,0 +1,24 @@
+"""
+A shortest path problem on a digraph in which the source is on a
+negative cycle, but the target cannot be reached from the source.  No
+negative cycle is reported.
+
+Expected solution:
+    - Negative cycle? False
+    - Shortest path length = inf
+    - Shortest path = []
+"""
+
+import networkx as nx
+import bellmanford as bf
+
+G = nx.DiGraph()
+G.add_edge(0, 1, length=-5)
+G.add_edge(1, 0, length=1)
+G.add_edge(2, 3, length=1)
+
+length, nodes, negative_cycle = bf.bellman_ford(G, source=0, target=3, weight='length')
+
+print("Negative cycle?", negative_cycle)
+print("Shortest path length =", length)
+print("Shortest path =", nodes)
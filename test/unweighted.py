@@ -0,0 +1,25 @@
+"""
+The digraph in test/simple.py without edge lengths, so that every edge
+has length 1 and a breadth-first search is used.
+
+Expected solution:
+    - Negative cycle? False
+    - Shortest path length = 2
+    - Shortest path = [1, 2, 4]
+"""
+
+import networkx as nx
+import bellmanford as bf
+
+G = nx.DiGraph()
+G.add_edge(1, 2)
+G.add_edge(1, 3)
+G.add_edge(2, 3)
+G.add_edge(2, 4)
+G.add_edge(3, 4)
+
+length, nodes, negative_cycle = bf.bellman_ford(G, source=1, target=4)
+
+print("Negative cycle?", negative_cycle)
+print("Shortest path length =", length)
+print("Shortest path =", nodes)